@@ -1,16 +1,21 @@
 # app/__init__.py
 import json
+import threading
 from urllib.parse import urlencode, quote_plus
-from flask import Flask, redirect, render_template, session, url_for
+from flask import Flask, g, redirect, render_template, session, url_for
 from flask_cors import CORS
 from authlib.integrations.flask_client import OAuth
 from .config import Config
+from .json_provider import OrjsonProvider
+from .sessions import CachedSessionInterface
 
 
 def make_app():
     app = Flask("Sensor")
     app.config.from_object(Config)
     app.secret_key = app.config["SECRET_KEY"]
+    app.json = OrjsonProvider(app)
+    app.session_interface = CachedSessionInterface()
 
     frontend_url = app.config["FRONTEND_URL"]
 
@@ -26,6 +31,19 @@ def make_app():
         client_kwargs={"scope": "openid profile email"},
         server_metadata_url=f'https://{app.config["AUTH0_DOMAIN"]}/.well-known/openid-configuration',
     )
+    # Fetch the OIDC discovery document and JWKS in the background instead of
+    # on the first /login and /callback; authlib keeps both on
+    # oauth.auth0.server_metadata. This runs off the startup path so a slow
+    # or unreachable Auth0 never blocks app creation, and both are still
+    # loaded lazily if this has not finished.
+    def prefetch_auth0():
+        try:
+            oauth.auth0.load_server_metadata()
+            oauth.auth0.fetch_jwk_set()
+        except Exception as e:
+            app.logger.warning("Could not prefetch Auth0 metadata, will retry on /login: %s", e)
+
+    threading.Thread(target=prefetch_auth0, name="auth0-prefetch", daemon=True).start()
 
     # --- Auth routes ---
     @app.route("/login")
@@ -54,6 +72,11 @@ def make_app():
                 quote_via=quote_plus,
             )
         )
+    # Per-request row cache (see routes.tickets.get_badlog); dropped with `g`
+    @app.before_request
+    def reset_row_cache():
+        g._row_cache = {}
+
     # The tickets module exposes the `bad_logs` blueprint (reflecting the bad_logs table)
     from .routes.tickets import bad_logs
     app.register_blueprint(bad_logs)
@@ -12,17 +12,26 @@ DB_NAME = os.getenv("DB_NAME", "postgres")
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
 
+# Pool bounds default to SQLAlchemy's own (5 + 10 overflow). Set them to match
+# the server's worker thread count, or requests queue on connection checkout.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
 DATABASE_URL = (
     f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
 
 
+# SQL_ECHO=1 logs every emitted statement; keep it off on the request path
+SQL_ECHO = os.getenv("SQL_ECHO") == "1"
+
 engine = create_engine(
     DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,   
-    echo=True             
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    echo=SQL_ECHO,
+    query_cache_size=1200,  # compiled-statement cache (SQLAlchemy default is 500)
 )
 
 # ORM
@@ -19,9 +19,12 @@ if "bad_logs" not in metadata.tables:
 # The automap class will be available as Base.classes.bad_logs
 BadLog = getattr(Base.classes, "bad_logs")
 
+# Column names resolved once at import instead of walking __table__ per row
+_COLUMN_NAMES = tuple(c.name for c in BadLog.__table__.columns)
+
 def badlog_to_dict(self):
     # Convert SQLAlchemy object to dict using its table columns
-    return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+    return {name: getattr(self, name) for name in _COLUMN_NAMES}
 
 def badlog_repr(self):
     host = getattr(self, "hostname", None) or "unknown"
@@ -1,37 +1,82 @@
-from flask import Blueprint, jsonify, request
-from sqlalchemy import desc
+from flask import Blueprint, Response, g, jsonify, request
+from sqlalchemy import desc, insert, select
 from datetime import datetime
+from typing import Optional
+import msgspec
+import orjson
 from ..database import get_db
+from ..json_provider import ORJSON_OPTIONS
 from ..models import BadLog
 
 bad_logs = Blueprint('bad_logs', __name__)
 
+
+def ojson(payload, status=200):
+    """Serialize a large payload straight to bytes and hand it to the server as-is"""
+    return Response(
+        orjson.dumps(payload, default=str, option=ORJSON_OPTIONS),
+        status,
+        mimetype='application/json',
+        direct_passthrough=True,
+    )
+
+
+class BadLogIn(msgspec.Struct):
+    """Request body for creating a log; decoded and type-checked in one C pass"""
+    upload_ts: Optional[str] = None
+    hostname: Optional[str] = None
+    label: Optional[str] = None
+    log_line: Optional[str] = None
+
+
+def decode_body(kind):
+    """Decode the request body as `kind`; returns (data, error_response)"""
+    raw = request.get_data()
+    if not raw:
+        return None, (jsonify({'error': 'No data provided'}), 400)
+    try:
+        return msgspec.json.decode(raw, type=kind), None
+    except msgspec.ValidationError as e:
+        return None, (jsonify({'error': str(e)}), 400)
+    except msgspec.DecodeError:
+        return None, (jsonify({'error': 'Invalid JSON'}), 400)
+
+
+def get_badlog(db, log_id):
+    """Fetch a BadLog by primary key, memoized for the current request"""
+    cache = g._row_cache
+    if log_id not in cache:
+        cache[log_id] = db.get(BadLog, log_id)
+    return cache[log_id]
+
+
 @bad_logs.route('/logs', methods=['GET'])
 def get_logs():
     """Get all logs, optionally filtered by label or hostname"""
     with get_db() as db:
-        query = db.query(BadLog)
+        # Read-only listing: select plain columns so rows skip ORM hydration
+        stmt = select(*BadLog.__table__.columns)
 
         label = request.args.get('label')
         hostname = request.args.get('hostname')
 
         if label:
-            query = query.filter(BadLog.label == label)
+            stmt = stmt.where(BadLog.label == label)
         if hostname:
-            query = query.filter(BadLog.hostname == hostname)
+            stmt = stmt.where(BadLog.hostname == hostname)
 
         # Order by most recent
-        query = query.order_by(desc(BadLog.logged_at))
+        stmt = stmt.order_by(desc(BadLog.logged_at))
 
-        logs = query.all()
-        return jsonify([log.to_dict() for log in logs]), 200
+        rows = db.execute(stmt).mappings().all()
+        return ojson([dict(row) for row in rows])
 
 
 @bad_logs.route('/logs/<int:log_id>', methods=['GET'])
 def get_log(log_id):
     """Get a specific log entry by ID"""
     with get_db() as db:
-        log = db.query(BadLog).filter(BadLog.id == log_id).first()
+        log = get_badlog(db, log_id)
         if not log:
             return jsonify({'error': 'Log not found'}), 404
         return jsonify(log.to_dict()), 200
@@ -40,22 +85,34 @@ def get_log(log_id):
 @bad_logs.route('/logs', methods=['POST'])
 def create_log():
     """Create a new log entry"""
-    data = request.get_json()
-    if not data:
+    data, error = decode_body(BadLogIn)
+    if error:
+        return error
+    if data == BadLogIn():
         return jsonify({'error': 'No data provided'}), 400
 
-    # Create new BadLog entry
-    new_log = BadLog(
-        upload_ts=data.get('upload_ts'),
-        hostname=data.get('hostname'),
-        label=data.get('label'),
-        log_line=data.get('log_line'),
-    )
+    # One dict is both the INSERT parameters and the response body;
+    # only the server-generated columns are read back
+    row = msgspec.structs.asdict(data)
+    stmt = insert(BadLog.__table__).returning(BadLog.id, BadLog.logged_at)
+
+    with get_db() as db:
+        row['id'], row['logged_at'] = db.execute(stmt, row).one()
+    return jsonify(row), 201
+
+
+@bad_logs.route('/logs/bulk', methods=['POST'])
+def create_logs_bulk():
+    """Create many log entries from a JSON array in a single executemany"""
+    rows, error = decode_body(list[BadLogIn])
+    if error:
+        return error
+    if not rows:
+        return jsonify({'error': 'No data provided'}), 400
 
     with get_db() as db:
-        db.add(new_log)
-        db.flush()
-        return jsonify(new_log.to_dict()), 201
+        db.execute(insert(BadLog.__table__), [msgspec.structs.asdict(r) for r in rows])
+    return '', 204
 
 
 @bad_logs.route('/logs/<int:log_id>', methods=['PUT'])
@@ -66,7 +123,7 @@ def update_log(log_id):
         return jsonify({'error': 'No data provided'}), 400
 
     with get_db() as db:
-        log = db.query(BadLog).filter(BadLog.id == log_id).first()
+        log = get_badlog(db, log_id)
         if not log:
             return jsonify({'error': 'Log not found'}), 404
 
@@ -87,9 +144,10 @@ def update_log(log_id):
 def delete_log(log_id):
     """Delete a log entry"""
     with get_db() as db:
-        log = db.query(BadLog).filter(BadLog.id == log_id).first()
+        log = get_badlog(db, log_id)
         if not log:
             return jsonify({'error': 'Log not found'}), 404
 
         db.delete(log)
+        g._row_cache.pop(log_id, None)
         return jsonify({'message': 'Log deleted successfully'}), 200
@@ -0,0 +1,18 @@
+from flask.sessions import SecureCookieSessionInterface
+
+
+class CachedSessionInterface(SecureCookieSessionInterface):
+    """Cookie sessions that build the signing serializer once per secret key
+
+    The stock interface constructs a new URLSafeTimedSerializer on every
+    request, both when opening and when saving the session.
+    """
+
+    _serializer = None
+    _serializer_key = None
+
+    def get_signing_serializer(self, app):
+        if self._serializer_key != app.secret_key:
+            self._serializer = super().get_signing_serializer(app)
+            self._serializer_key = app.secret_key
+        return self._serializer
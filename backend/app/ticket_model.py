@@ -29,16 +29,23 @@ class BadLog(Base):
 
     __table_args__ = (
         Index('idx_badlogs_label_host', 'label', 'hostname'),
+        # GET /logs filters by label or hostname and sorts by logged_at DESC;
+        # these let Postgres answer it with a backward index scan, no sort
+        Index('idx_badlogs_label_logged_at', 'label', 'logged_at'),
+        Index('idx_badlogs_hostname_logged_at', 'hostname', 'logged_at'),
     )
 
     def __repr__(self):
         return f"<BadLog {self.id} - {self.hostname or 'unknown'} - {self.label or 'no_label'}>"
 
     def to_dict(self):
-        """Convert log record to dict (for API responses or JSON serialization)"""
+        """Convert log record to dict (for API responses or JSON serialization)
+
+        logged_at stays a datetime; orjson formats it as RFC 3339 in C.
+        """
         return {
             "id": self.id,
-            "logged_at": self.logged_at.isoformat() if self.logged_at else None,
+            "logged_at": self.logged_at,
             "upload_ts": self.upload_ts,
             "hostname": self.hostname,
             "label": self.label,
@@ -4,33 +4,75 @@ central_logger.py
 
 Flask server that:
 - Accepts POST /upload with multipart file + hostname + timestamp
-- Saves the incoming file
+  (a .zst file is decompressed while it is saved)
+- Saves the incoming file and answers 202; a background thread classifies it
 - Loads the trained model from log_reason_full.pkl (via joblib)
-- Scans file line-by-line and classifies each line using model.predict([line])[0]
+- Scans file line-by-line and classifies the lines in batches via model.predict(lines)
 - Writes NON-GOOD_LOG lines in non_good_logs.txt
-- Prints every analyzed line and its label to the console
+- Logs every analyzed line and its label at DEBUG level (LOG_LEVEL=DEBUG)
 - Pushes NON-GOOD_LOG lines into an RDS PostgreSQL table bad_logs
+
+Production: gunicorn -c gunicorn.conf.py central_intelligence_agency:app
+Development: python central_intelligence_agency.py
 """
 
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+import atexit
+import logging
+import mmap
+import queue
+import shutil
 import sys
 import os
+import threading
+import uuid
+
+# One BLAS/OpenMP thread per process: concurrent uploads would otherwise
+# oversubscribe the cores. Must be set before sklearn is imported
+# (joblib.load imports it while unpickling the model).
+os.environ.setdefault("OMP_NUM_THREADS", "1")
 
-from flask import Flask, request, jsonify
+from flask import Flask, request
 import joblib
+import numpy as np
+import orjson
 import psycopg2
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+
+try:
+    import zstandard  # optional: agents upload .zst snapshots when it is installed
+except ImportError:
+    zstandard = None
 
 app = Flask(__name__)
 
+# Per-line [ANALYZE] output is DEBUG-level: set LOG_LEVEL=DEBUG to see it
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), format="%(message)s")
+logger = logging.getLogger(__name__)
+
 # === Paths ===
 BASE_DIR = Path(__file__).resolve().parent
 RECEIVED_DIR = BASE_DIR / "received_logs"
 RECEIVED_DIR.mkdir(exist_ok=True)
+_RECEIVED_DIR_STR = str(RECEIVED_DIR)  # joined with plain strings on the upload path
 
 MODEL_PATH = BASE_DIR / "log_reason_full.pkl"
 NON_GOOD_FILE = BASE_DIR / "non_good_logs.txt"
 
+# Filename sanitization tables (one str.translate pass instead of chained replaces)
+_HOSTNAME_TABLE = str.maketrans({" ": "_", "/": "_", "\\": "_"})
+_TIMESTAMP_TABLE = str.maketrans({" ": "_", ":": None, "/": "_"})
+
+# Lines per model.predict call; bounds memory while amortizing TF-IDF + matmul
+PREDICT_BATCH_SIZE = 10_000
+
+# Block size for saving uploads and buffering the non-GOOD log (vs. the 8 KiB default)
+IO_BUFFER_SIZE = 1 << 20
+
 # === DB config (env vars override these defaults) ===
 DB_HOST = os.environ.get("DB_HOST", "database-1.csfc6cuael0m.us-east-1.rds.amazonaws.com")
 DB_PORT = int(os.environ.get("DB_PORT", "5432"))
@@ -38,96 +80,138 @@ DB_NAME = os.environ.get("DB_NAME", "postgres")
 DB_USER = os.environ.get("DB_USER", "postgres")
 DB_PASSWORD = os.environ.get("DB_PASSWORD", "REDACT CREDS")
 
-db_conn = None  # global connection handle
+# Pool of connections, created lazily so each (gunicorn) process opens its own
+DB_POOL_MAX = int(os.environ.get("DB_POOL_MAX", "8"))
+db_pool = None
+_db_pool_lock = threading.Lock()
 
 
-def get_db_connection():
-    """Get or create a global PostgreSQL connection."""
-    global db_conn
+def get_db_pool():
+    """Get or create the process-wide PostgreSQL connection pool."""
+    global db_pool
 
-    if db_conn is not None:
+    with _db_pool_lock:
+        if db_pool is None:
+            try:
+                db_pool = ThreadedConnectionPool(
+                    1,
+                    DB_POOL_MAX,
+                    host=DB_HOST,
+                    port=DB_PORT,
+                    dbname=DB_NAME,
+                    user=DB_USER,
+                    password=DB_PASSWORD,
+                    connect_timeout=5,
+                )
+                print("[db] Connected to PostgreSQL")
+            except Exception as e:
+                print(f"[db-ERROR] Could not connect to PostgreSQL: {e}", file=sys.stderr)
+        return db_pool
+
+
+@contextmanager
+def db_connection():
+    """Borrow a pooled connection (None if the DB is unreachable). Broken ones are discarded."""
+    pool = get_db_pool()
+    conn = None
+    if pool is not None:
         try:
-            with db_conn.cursor() as cur:
-                cur.execute("SELECT 1;")
-            return db_conn
-        except Exception:
+            conn = pool.getconn()
+        except Exception as e:
+            print(f"[db-ERROR] Could not get a pooled connection: {e}", file=sys.stderr)
+    try:
+        yield conn
+    finally:
+        if conn is not None:
+            pool.putconn(conn, close=bool(conn.closed))
+
+
+def close_db_pool():
+    """Close every pooled connection (e.g. before gunicorn forks workers)."""
+    global db_pool
+
+    with _db_pool_lock:
+        if db_pool is not None:
             try:
-                db_conn.close()
+                db_pool.closeall()
             except Exception:
                 pass
-            db_conn = None
-
-    try:
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            dbname=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            connect_timeout=5,
-        )
-        conn.autocommit = True
-        db_conn = conn
-        print("[db] Connected to PostgreSQL")
-        return db_conn
-    except Exception as e:
-        print(f"[db-ERROR] Could not connect to PostgreSQL: {e}", file=sys.stderr)
-        return None
+            db_pool = None
 
 
 def init_db():
     """
     Create bad_logs table and indexes if they don't exist.
     """
-    conn = get_db_connection()
-    if conn is None:
-        print("[db-WARN] Cannot init DB (no connection).", file=sys.stderr)
-        return
+    with db_connection() as conn:
+        if conn is None:
+            print("[db-WARN] Cannot init DB (no connection).", file=sys.stderr)
+            return
 
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS bad_logs (
-                    id          SERIAL PRIMARY KEY,
-                    logged_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-                    upload_ts   TEXT,
-                    hostname    TEXT,
-                    label       TEXT,
-                    log_line    TEXT
-                );
-                """
-            )
-            # Indexes to speed up queries by hostname and label
-            cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_badlogs_hostname ON bad_logs (hostname);"
-            )
-            cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_badlogs_label ON bad_logs (label);"
-            )
-        print("[db] bad_logs table and indexes are ready.")
-    except Exception as e:
-        print(f"[db-WARN] Failed to init DB schema: {e}", file=sys.stderr)
-
-
-def insert_bad_log(upload_ts, hostname, label, log_line):
-    """Insert a single bad log line into the bad_logs table."""
-    conn = get_db_connection()
-    if conn is None:
-        print("[db-WARN] Skipping DB insert (no connection).", file=sys.stderr)
+        try:
+            with conn, conn.cursor() as cur:
+                cur.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS bad_logs (
+                        id          SERIAL PRIMARY KEY,
+                        logged_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                        upload_ts   TEXT,
+                        hostname    TEXT,
+                        label       TEXT,
+                        log_line    TEXT
+                    );
+                    """
+                )
+                # Indexes to speed up queries by hostname and label
+                cur.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_badlogs_hostname ON bad_logs (hostname);"
+                )
+                cur.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_badlogs_label ON bad_logs (label);"
+                )
+                # Filtered "most recent first" listings served by the API
+                cur.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_badlogs_label_logged_at ON bad_logs (label, logged_at);"
+                )
+                cur.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_badlogs_hostname_logged_at ON bad_logs (hostname, logged_at);"
+                )
+            print("[db] bad_logs table and indexes are ready.")
+        except Exception as e:
+            print(f"[db-WARN] Failed to init DB schema: {e}", file=sys.stderr)
+
+
+def insert_bad_logs(rows):
+    """
+    Insert (upload_ts, hostname, label, log_line) rows into bad_logs.
+    Uses multi-row INSERTs of up to 1000 rows, all in one transaction.
+    A connection that went stale in the pool is retried once on a fresh one.
+    """
+    if not rows:
         return
 
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO bad_logs (upload_ts, hostname, label, log_line)
-                VALUES (%s, %s, %s, %s);
-                """,
-                (upload_ts, hostname, label, log_line),
-            )
-    except Exception as e:
-        print(f"[db-WARN] Failed to insert bad log: {e}", file=sys.stderr)
+    for attempt in range(2):
+        with db_connection() as conn:
+            if conn is None:
+                print("[db-WARN] Skipping DB insert (no connection).", file=sys.stderr)
+                return
+
+            try:
+                with conn, conn.cursor() as cur:  # commit on success, rollback on error
+                    execute_values(
+                        cur,
+                        "INSERT INTO bad_logs (upload_ts, hostname, label, log_line) VALUES %s",
+                        rows,
+                        page_size=1000,
+                    )
+                return
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                if attempt or not conn.closed:
+                    print(f"[db-WARN] Failed to insert {len(rows)} bad logs: {e}", file=sys.stderr)
+                    return
+            except Exception as e:
+                print(f"[db-WARN] Failed to insert {len(rows)} bad logs: {e}", file=sys.stderr)
+                return
 
 
 # === Load model ===
@@ -139,83 +223,312 @@ except Exception as e:
     print(f"[ERROR] Failed to load model from {MODEL_PATH}: {e}", file=sys.stderr)
     model = None
 
+# Keep direct references to the pipeline stages so predictions skip the
+# Pipeline.predict dispatch (the model is TF-IDF -> linear classifier).
+vectorizer = classifier = None
+if model is not None and len(getattr(model, "steps", ())) >= 2:
+    vectorizer = model[:-1] if len(model.steps) > 2 else model.steps[0][1]
+    classifier = model.steps[-1][1]
+
+# Linear classifier in float32: halves the bytes moved by the sparse TF-IDF x
+# coef_ product. Only worth it if the vectorizer also emits float32 (older
+# sklearn upcasts in the idf step), otherwise every predict would convert.
+if classifier is not None and hasattr(classifier, "coef_") and hasattr(vectorizer, "dtype"):
+    vectorizer.dtype = np.float32
+    if vectorizer.transform(["warmup"]).dtype == np.float32:
+        classifier.coef_ = classifier.coef_.astype(np.float32)
+        classifier.intercept_ = np.asarray(classifier.intercept_, dtype=np.float32)
+        print("[init] Classifier weights cast to float32.")
+    else:
+        vectorizer.dtype = np.float64
+
+
+def predict(lines):
+    """Run the model on a list of lines."""
+    if classifier is not None:
+        return classifier.predict(vectorizer.transform(lines))
+    return model.predict(lines)
+
+
+# Warm up: the first predict pays for lazy imports, BLAS init and the first
+# sparse allocations; do that now instead of on the first upload.
+if model is not None:
+    try:
+        for n in (1, 32, 1024):
+            predict(["warmup"] * n)
+        print("[init] Model warmed up.")
+    except Exception as e:
+        print(f"[WARN] Model warm-up failed: {e}", file=sys.stderr)
+
+
+# line -> label for lines seen in previous uploads, least recently used first
+LABEL_CACHE_SIZE = 500_000
+label_cache = OrderedDict()
+label_cache_lock = threading.Lock()
+
 
 def classify_line(line: str):
-    """Predict tag for a single log line."""
+    """Predict tag for a single log line (classify_lines caches the labels)."""
     if model is None:
         return None
     try:
-        pred = model.predict([line])[0]
+        pred = predict([line])[0]
         return pred
     except Exception as e:
         print(f"[WARN] Prediction failed for line: {e}", file=sys.stderr)
         return None
 
 
-@app.route("/upload", methods=["POST"])
-def upload_logs():
-    if "file" not in request.files:
-        return jsonify({"error": "missing file field"}), 400
+def classify_lines(lines):
+    """Predict tags for a batch of lines with a single model.predict call.
 
-    uploaded_file = request.files["file"]
-    if uploaded_file.filename == "":
-        return jsonify({"error": "empty filename"}), 400
+    Duplicate lines are classified once and their label is reused. Labels of
+    lines seen in earlier uploads come from label_cache, so those lines skip
+    both TF-IDF vectorization and the classifier.
+    """
+    if model is None:
+        return [None] * len(lines)
+    unique = dict.fromkeys(lines)
+
+    with label_cache_lock:
+        for line in unique:
+            label = label_cache.get(line)
+            if label is not None:
+                label_cache.move_to_end(line)
+                unique[line] = label
+    misses = [line for line, label in unique.items() if label is None]
+
+    if misses:
+        try:
+            predicted = dict(zip(misses, predict(misses)))
+        except Exception as e:
+            print(f"[WARN] Batched prediction failed, falling back per line: {e}", file=sys.stderr)
+            predicted = {line: classify_line(line) for line in misses}
+        unique.update(predicted)
+        with label_cache_lock:
+            for line, label in predicted.items():
+                if label is not None:
+                    label_cache[line] = label
+            while len(label_cache) > LABEL_CACHE_SIZE:
+                label_cache.popitem(last=False)
+
+    logger.debug("[cache] %d lines in batch, %d unique, %d sent to the model",
+                 len(lines), len(unique), len(misses))
+    return [unique[line] for line in lines]
+
+
+def process_batch(lines, hostname, timestamp, f_out):
+    """Classify a batch of lines, record the non-GOOD ones. Returns their count."""
+    labels = classify_lines(lines)
+    # Tags come from a small fixed set: decide GOOD/non-GOOD once per distinct
+    # tag rather than upper()+startswith() on every line
+    is_good = {
+        label: str(label).upper().startswith("GOOD_LOG")
+        for label in set(labels) if label is not None
+    }
+
+    analyze = logger.isEnabledFor(logging.DEBUG)
+    bad_rows = []
+    records = []
+    for line, label in zip(lines, labels):
+        if label is None:
+            continue
+
+        # Log every line analyzed (no-op unless LOG_LEVEL=DEBUG)
+        if analyze:
+            logger.debug("[ANALYZE] %s | %s | %s", hostname, label, line)
+
+        # Skip GOOD logs
+        if is_good[label]:
+            continue
+
+        records.append(f"{timestamp} {hostname} {label}\n{line}\n\n")
+        bad_rows.append((timestamp, hostname, str(label), line))
+
+    # Write bad logs to local file: the whole batch in one O_APPEND write, so
+    # the records of concurrent workers never interleave mid-record
+    if records:
+        f_out.write("".join(records).encode("utf-8", errors="replace"))
+
+    # Insert the batch's bad logs into RDS
+    insert_bad_logs(bad_rows)
+    return len(bad_rows)
+
+
+def classify_upload(out_path, hostname, timestamp):
+    """Classify a saved upload line by line, recording its non-GOOD lines."""
+    lines_scanned = 0
+    non_good_count = 0
 
-    hostname = request.form.get("hostname", "unknown_host")
-    timestamp = request.form.get("timestamp", datetime.utcnow().strftime("%Y%m%d_%H%M%S"))
+    # mmap the saved file: pages come straight from the page cache (the file
+    # was just written) and mm.readline slices lines in C without a read buffer
+    out_name = os.path.basename(out_path)
+    with open(out_path, "rb") as f_in:
+        if os.fstat(f_in.fileno()).st_size == 0:
+            print(f"[done] {out_name}: empty upload.")
+            return
+        with mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            batch = []
+            for raw in iter(mm.readline, b""):
+                # Drop only the line ending; blank lines are skipped before
+                # decoding (TF-IDF tokenization ignores other whitespace)
+                raw = raw.rstrip(b"\r\n")
+                if not raw or raw.isspace():
+                    continue
+                line = raw.decode("utf-8", errors="replace")
+
+                lines_scanned += 1
+                batch.append(line)
+                if len(batch) >= PREDICT_BATCH_SIZE:
+                    non_good_count += process_batch(batch, hostname, timestamp, non_good_out)
+                    batch = []
+
+            if batch:
+                non_good_count += process_batch(batch, hostname, timestamp, non_good_out)
+
+    print(f"[done] {out_name}: {lines_scanned} lines processed, "
+          f"{non_good_count} non-GOOD logs detected.")
+
+
+# === Background classification ===
+# /upload only saves the file; a per-process worker thread classifies it.
+# Every gunicorn worker process appends to the same non-GOOD log, so the
+# handle is unbuffered O_APPEND and process_batch writes whole records only,
+# one write per batch; it is opened once instead of reopened per upload.
+non_good_out = NON_GOOD_FILE.open("ab", buffering=0)
+atexit.register(non_good_out.close)
+upload_queue = queue.Queue()
+_worker_lock = threading.Lock()
+_worker = None
+
+
+def classify_worker():
+    """Classify queued uploads one at a time; a failing upload is logged and skipped."""
+    while True:
+        out_path, hostname, timestamp = upload_queue.get()
+        try:
+            classify_upload(out_path, hostname, timestamp)
+        except Exception:
+            # The saved file is kept, so it can be classified again later
+            logger.exception("[ERROR] Failed to classify %s from %s; skipped", out_path, hostname)
+        finally:
+            upload_queue.task_done()
 
-    safe_hostname = (
-        hostname.replace(" ", "_")
-        .replace("/", "_")
-        .replace("\\", "_")
-        .replace("..", "_")
-    )
-    safe_timestamp = timestamp.replace(" ", "_").replace(":", "").replace("/", "_")
 
-    original_name = Path(uploaded_file.filename).name
-    out_name = f"{safe_hostname}_{safe_timestamp}_{original_name}"
-    out_path = RECEIVED_DIR / out_name
+@atexit.register
+def log_pending_uploads():
+    """On shutdown, name the uploads that were saved but not yet classified."""
+    pending = [out_path for out_path, _, _ in list(upload_queue.queue)]
+    if pending:
+        logger.warning("[exit] %d queued upload(s) left unclassified: %s",
+                       len(pending), ", ".join(pending))
 
-    uploaded_file.save(out_path)
-    print(f"[recv] {out_name} ({out_path.stat().st_size} bytes) from {hostname}")
 
-    lines_scanned = 0
-    non_good_count = 0
+def ensure_worker():
+    """Start the worker on first use, so each gunicorn worker (post-fork) gets its own."""
+    global _worker
+
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=classify_worker, name="classify", daemon=True)
+            _worker.start()
+
+
+# Werkzeug's default stream factory keeps uploads up to this size in memory
+# (a SpooledTemporaryFile) and spools larger ones to a temporary file
+SPOOL_MAX_SIZE = 500 * 1024
 
-    # Process line-by-line
-    with out_path.open("r", encoding="utf-8", errors="replace") as f_in, \
-         NON_GOOD_FILE.open("a", encoding="utf-8", errors="replace") as f_out:
 
-        for line in f_in:
-            line = line.strip()
-            if not line:
-                continue
+def save_upload(stream, out_path):
+    """
+    Write an uploaded file's stream to out_path (which must not exist yet; an
+    existing file is never truncated) and return the byte count.
+
+    An upload larger than SPOOL_MAX_SIZE is already on disk, so it is copied
+    in-kernel with os.sendfile. A smaller one is still in memory: calling
+    fileno() on it would first force it to disk, so it is copied with
+    shutil.copyfileobj through a buffered file, as is any stream without a
+    usable fd.
+    """
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(0)
+    with open(out_path, "xb") as f_save:
+        if size > SPOOL_MAX_SIZE:
+            try:
+                src_fd = stream.fileno()
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(f_save.fileno(), src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return offset
+            except OSError:  # no real fd (io.UnsupportedOperation) or no file-to-file sendfile
+                f_save.seek(0)
+                f_save.truncate()
+                stream.seek(0)
+
+        shutil.copyfileobj(stream, f_save, IO_BUFFER_SIZE)
+        return f_save.tell()
+
+
+def save_zstd_upload(stream, out_path):
+    """Decompress a zstd-framed upload into a new out_path; return the decompressed byte count."""
+    dctx = zstandard.ZstdDecompressor()
+    with open(out_path, "xb") as f_save:
+        _, written = dctx.copy_stream(
+            stream, f_save, read_size=IO_BUFFER_SIZE, write_size=IO_BUFFER_SIZE
+        )
+        return written
+
 
-            lines_scanned += 1
-            label = classify_line(line)
-            if label is None:
-                continue
+def json_response(payload, status=200):
+    """Build a JSON response with orjson (serialized in C, no jsonify overhead)."""
+    return app.response_class(orjson.dumps(payload), status=status, mimetype="application/json")
 
-            # Print every line analyzed
-            print(f"[ANALYZE] {hostname} | {label} | {line}")
 
-            # Skip GOOD logs
-            if str(label).upper().startswith("GOOD_LOG"):
-                continue
+@app.route("/upload", methods=["POST"])
+def upload_logs():
+    if "file" not in request.files:
+        return json_response({"error": "missing file field"}, 400)
 
-            # Write bad logs to local file
-            f_out.write(f"{timestamp} {hostname} {label}\n{line}\n\n")
-            non_good_count += 1
+    uploaded_file = request.files["file"]
+    if uploaded_file.filename == "":
+        return json_response({"error": "empty filename"}, 400)
 
-            # Insert bad log into RDS
-            insert_bad_log(timestamp, hostname, str(label), line)
+    hostname = request.form.get("hostname", "unknown_host")
+    timestamp = request.form.get("timestamp", datetime.utcnow().strftime("%Y%m%d_%H%M%S"))
 
-    print(f"[done] {lines_scanned} lines processed, {non_good_count} non-GOOD logs detected.")
-    return jsonify({
+    safe_hostname = hostname.translate(_HOSTNAME_TABLE).replace("..", "_")
+    safe_timestamp = timestamp.translate(_TIMESTAMP_TABLE)
+
+    # Basename of either a POSIX or a Windows client path, without building Path objects
+    original_name = uploaded_file.filename.rsplit("/", 1)[-1].rsplit("\\", 1)[-1]
+    compressed = original_name.endswith(".zst")
+    if compressed:
+        if zstandard is None:
+            return json_response({"error": "zstd uploads need the zstandard package"}, 415)
+        original_name = original_name[:-len(".zst")]
+    # Every upload gets its own file: the classify worker may still be mmap'd
+    # on an earlier upload of the same name (the agent retries after a lost
+    # 202), and truncating a mapped file kills the process with SIGBUS
+    out_name = f"{safe_hostname}_{safe_timestamp}_{uuid.uuid4().hex[:12]}_{original_name}"
+    out_path = os.path.join(_RECEIVED_DIR_STR, out_name)
+
+    if compressed:
+        received_bytes = save_zstd_upload(uploaded_file.stream, out_path)
+    else:
+        received_bytes = save_upload(uploaded_file.stream, out_path)
+    print(f"[recv] {out_name} ({received_bytes} bytes) from {hostname}")
+
+    ensure_worker()
+    upload_queue.put((out_path, hostname, timestamp))
+
+    return json_response({
         "received_file": out_name,
-        "lines_scanned": lines_scanned,
-        "non_good_count": non_good_count
-    }), 200
+        "received_bytes": received_bytes,
+        "status": "queued",
+    }, 202)
 
 
 if __name__ == "__main__":
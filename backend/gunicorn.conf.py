@@ -0,0 +1,21 @@
+# gunicorn.conf.py
+# gunicorn -c gunicorn.conf.py central_intelligence_agency:app
+import multiprocessing
+
+bind = "0.0.0.0:8000"
+workers = multiprocessing.cpu_count()
+worker_class = "gthread"
+threads = 4
+
+# Import the app (and unpickle + warm the model) once in the master;
+# workers share it copy-on-write after fork.
+preload_app = True
+
+
+def when_ready(server):
+    """Create the bad_logs schema once, before any worker is forked."""
+    import central_intelligence_agency as cia
+
+    cia.init_db()
+    # Don't let forked workers inherit (and share) the master's sockets
+    cia.close_db_pool()
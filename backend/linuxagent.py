@@ -6,24 +6,45 @@ Tails only the most common Linux log files (not recursive).
 Reads new lines every minute and writes them to timestamped snapshots.
 
 Behavior:
-- On FIRST run (no .log_offsets.json): starts from the END of each existing log,
+- On FIRST run (no .log_offsets.bin): starts from the END of each existing log,
   so it only captures NEW lines that appear after the script starts.
-- On later runs: resumes from saved offsets like before.
+- On later runs: resumes from saved offsets like before (an older
+  .log_offsets.json is migrated once).
 - Output files contain ONLY raw new log lines (no headers).
 - Snapshot filenames include the machine's hostname and timestamp.
-- Each non-empty snapshot is sent to a central logging server via HTTP POST.
+- Snapshots are capped at 8 MiB; a larger burst is split across several files.
+- With the zstandard package installed, snapshots are zstd-compressed
+  (.log.zst) before upload; the server decompresses them on receipt.
+- Each non-empty snapshot is sent to a central logging server via HTTP POST,
+  from a small upload pool so the tail loop never waits on the network.
 """
 
+import http.client
 import json
+import mmap
+import os
 import time
 import socket
+import struct
+import threading
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlsplit
 
-import requests  # pip install requests
+try:
+    import zstandard  # optional: pip install zstandard to upload compressed snapshots
+except ImportError:
+    zstandard = None
 
 # === Central logging config ===
 CENTRAL_LOG_SERVER_URL = "http://172.31.21.114:8000/upload"  # <-- change this
+_SERVER = urlsplit(CENTRAL_LOG_SERVER_URL)
+
+# One keep-alive HTTP connection per upload thread, reused across ticks
+_local = threading.local()
 
 # === Common logs across most Linux distros ===
 LOG_FILES = [
@@ -47,7 +68,32 @@ LOG_FILES = [
     "/var/log/apt/history.log",
 ]
 
+# Binary offsets state: fingerprint of LOG_FILES, then one u64 per log.
+# Reordering or editing LOG_FILES changes the fingerprint and resets state.
+_U64 = struct.Struct("<Q")
+_UNSET = (1 << 64) - 1  # log had no saved offset (it did not exist yet)
+STATE_LAYOUT = zlib.crc32("\n".join(LOG_FILES).encode())
+STATE_SIZE = _U64.size * (1 + len(LOG_FILES))
+
 POLL_INTERVAL_SECS = 60  # how often to check logs
+ZSTD_LEVEL = 3  # fast level; log text still compresses several-fold
+SNAPSHOT_MAX_BYTES = 8 * 1024 * 1024  # rotate to a new snapshot file past this size
+UPLOAD_WORKERS = 4  # snapshots uploaded concurrently, off the tail loop
+READ_CHUNK_SIZE = 1 << 16  # bytes per readinto; bounds memory on large catch-ups
+
+# Fallback copy buffer shared by every file and tick (only the tail loop reads logs)
+_READ_BUF = bytearray(READ_CHUNK_SIZE)
+_READ_MV = memoryview(_READ_BUF)
+
+# Bounded pool for snapshot uploads; peak disk/RSS is ~UPLOAD_WORKERS snapshots
+_UPLOADS = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="upload")
+
+# Small pool for the per-tick stat of every log
+_STATS = ThreadPoolExecutor(max_workers=8, thread_name_prefix="stat")
+
+# Log fds kept open across ticks: path -> (fd, st_dev, st_ino)
+_FDS = {}
+_O_NOATIME = getattr(os, "O_NOATIME", 0)  # Linux only: skip atime updates on read
 
 
 def get_hostname() -> str:
@@ -59,20 +105,48 @@ def get_hostname() -> str:
         return "unknown_host"
 
 
-def load_offsets(state_file: Path) -> dict:
+def open_state(state_file: Path) -> mmap.mmap:
     """
-    Load previously saved offsets if state file exists.
-    If not, initialize offsets to EOF for all existing logs,
+    Map the binary offsets file, creating it (or wiping one with the wrong
+    size) as needed. Layout: a LOG_FILES fingerprint, then one little-endian
+    u64 offset per LOG_FILES entry, in list order.
+    """
+    fd = os.open(state_file, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if os.fstat(fd).st_size != STATE_SIZE:
+            os.ftruncate(fd, 0)
+            os.ftruncate(fd, STATE_SIZE)  # all zeros: fingerprint won't match
+        return mmap.mmap(fd, STATE_SIZE)
+    finally:
+        os.close(fd)  # the mapping holds its own reference
+
+
+def load_offsets(state: mmap.mmap, legacy_file: Path) -> dict:
+    """
+    Load previously saved offsets from the mapped state file.
+    Falls back to the old .log_offsets.json (migrating it) if present.
+    If neither exists, initialize offsets to EOF for all existing logs,
     so we only capture NEW lines written after this script starts.
     """
-    if state_file.exists():
+    (layout,) = _U64.unpack_from(state, 0)
+    if layout == STATE_LAYOUT:
+        offsets = {}
+        for i, log_path in enumerate(LOG_FILES, start=1):
+            (off,) = _U64.unpack_from(state, i * _U64.size)
+            if off != _UNSET:
+                offsets[log_path] = off
+        print("[init] Loaded previous offsets from state file.")
+        return offsets
+
+    if legacy_file.exists():
         try:
-            with state_file.open("r", encoding="utf-8") as f:
+            with legacy_file.open("r", encoding="utf-8") as f:
                 offsets = json.load(f)
-                print("[init] Loaded previous offsets from state file.")
-                return offsets
+            save_offsets(state, offsets)
+            print(f"[init] Migrated previous offsets from {legacy_file}.")
+            return offsets
         except Exception as e:
-            print(f"[warn] Could not load state file {state_file}: {e}")
+            print(f"[warn] Could not load state file {legacy_file}: {e}")
 
     # First run or failed to load: start from end of current files
     print("[init] No valid prior state. Starting from end of existing logs.")
@@ -87,116 +161,322 @@ def load_offsets(state_file: Path) -> dict:
                 print(f"[warn] Could not stat {log_path}: {e}")
                 continue
     print(f"[init] Initialized {len(offsets)} log offsets at EOF.")
+    save_offsets(state, offsets)
     return offsets
 
 
-def save_offsets(state_file: Path, offsets: dict) -> None:
-    try:
-        with state_file.open("w", encoding="utf-8") as f:
-            json.dump(offsets, f, indent=2, sort_keys=True)
-    except Exception as e:
-        print(f"[warn] Failed to save state to {state_file}: {e}")
+def save_offsets(state: mmap.mmap, offsets: dict) -> None:
+    """
+    Write offsets into the mapped state file in place: no serialization and
+    no rewrite of the file. The kernel writes the dirty page back on its own,
+    and it survives an agent crash since it already sits in the page cache.
+    """
+    for i, log_path in enumerate(LOG_FILES, start=1):
+        _U64.pack_into(state, i * _U64.size, offsets.get(log_path, _UNSET))
+    _U64.pack_into(state, 0, STATE_LAYOUT)
+
+
+def get_connection() -> http.client.HTTPConnection:
+    """Return this upload thread's keep-alive connection to the central server."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn_cls = (
+            http.client.HTTPSConnection if _SERVER.scheme == "https" else http.client.HTTPConnection
+        )
+        conn = conn_cls(_SERVER.hostname, _SERVER.port, timeout=10)
+        _local.conn = conn
+    return conn
+
+
+def post_snapshot(fh, filename: str, hostname: str, ts: str) -> tuple:
+    """
+    POST an open snapshot as multipart/form-data and return (status, body).
+
+    Only the small multipart preamble and epilogue are built in memory; the
+    file itself goes out with socket.sendfile, so it is never read into the
+    process. Content-Length comes from fstat.
+    """
+    boundary = uuid.uuid4().hex
+    content_type = "application/zstd" if filename.endswith(".zst") else "text/plain"
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="hostname"\r\n\r\n{hostname}\r\n'
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="timestamp"\r\n\r\n{ts}\r\n'
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+    size = os.fstat(fh.fileno()).st_size
+
+    conn = get_connection()
+    conn.putrequest("POST", _SERVER.path or "/")
+    conn.putheader("Content-Type", f"multipart/form-data; boundary={boundary}")
+    conn.putheader("Content-Length", str(len(head) + size + len(tail)))
+    conn.endheaders()
+    conn.sock.sendall(head)
+    conn.sock.sendfile(fh, 0, size)
+    conn.sock.sendall(tail)
+
+    resp = conn.getresponse()
+    return resp.status, resp.read()
+
+
+def compress_snapshot(file_path: Path) -> Path:
+    """
+    Replace a finished snapshot with its zstd-compressed .zst copy.
+
+    Runs on the upload thread, off the tail loop; each thread keeps its own
+    compressor since ZstdCompressor instances are not thread-safe.
+    """
+    cctx = getattr(_local, "cctx", None)
+    if cctx is None:
+        cctx = _local.cctx = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    zst_path = file_path.with_name(file_path.name + ".zst")
+    with file_path.open("rb") as src, zst_path.open("wb") as dst:
+        cctx.copy_stream(src, dst, size=os.fstat(src.fileno()).st_size)
+    file_path.unlink()
+    return zst_path
 
 
 def send_to_central_server(file_path: Path, hostname: str, ts: str) -> None:
     """Upload the snapshot file to the central logging server."""
     try:
+        if zstandard is not None:
+            file_path = compress_snapshot(file_path)
         with file_path.open("rb") as fh:
-            files = {"file": (file_path.name, fh, "text/plain")}
-            data = {"hostname": hostname, "timestamp": ts}
-            resp = requests.post(
-                CENTRAL_LOG_SERVER_URL,
-                data=data,
-                files=files,
-                timeout=10,
-            )
-        if resp.ok:
-            print(f"[send] Uploaded {file_path} to central server ({resp.status_code}).")
+            try:
+                status, body = post_snapshot(fh, file_path.name, hostname, ts)
+            except (http.client.HTTPException, ConnectionError):
+                # The server may have dropped the idle keep-alive connection
+                # since the last tick; reconnect and retry once
+                get_connection().close()
+                status, body = post_snapshot(fh, file_path.name, hostname, ts)
+        if 200 <= status < 300:
+            print(f"[send] Uploaded {file_path} to central server ({status}).")
         else:
             print(
                 f"[send] Failed to upload {file_path}: "
-                f"status={resp.status_code}, body={resp.text[:200]}"
+                f"status={status}, body={body[:200].decode('utf-8', errors='replace')}"
             )
     except Exception as e:
+        get_connection().close()
         print(f"[send] Error uploading {file_path} to central server: {e}")
 
 
+def copy_range(src_fd: int, out, offset: int, count: int) -> int:
+    """
+    Append count bytes of src_fd starting at offset to out; return bytes copied.
+
+    Uses os.sendfile so the bytes never pass through user space, falling back
+    to preadv into the shared buffer where file-to-file sendfile is
+    unsupported. Neither moves the fd's file position. The snapshot is raw
+    bytes, exactly what the server receives.
+    """
+    out_fd = out.fileno()
+    copied = 0
+    try:
+        while copied < count:
+            sent = os.sendfile(out_fd, src_fd, offset + copied, count - copied)
+            if sent == 0:
+                break  # file shrank under us
+            copied += sent
+        return copied
+    except (AttributeError, OSError):
+        pass
+    while copied < count:
+        n = os.preadv(src_fd, [_READ_MV[:min(READ_CHUNK_SIZE, count - copied)]], offset + copied)
+        if not n:
+            break
+        out.write(_READ_MV[:n])
+        copied += n
+    return copied
+
+
+def last_line_end(src_fd: int, start: int, end: int) -> int:
+    """
+    Offset just past the last b"\n" in src_fd[start:end], or start if that
+    range holds no complete line. Reads backwards from end in
+    READ_CHUNK_SIZE windows, so usually only the final window is touched.
+    """
+    while end > start:
+        lo = max(start, end - READ_CHUNK_SIZE)
+        n = os.preadv(src_fd, [_READ_MV[:end - lo]], lo)
+        i = _READ_BUF.rfind(b"\n", 0, n)
+        if i != -1:
+            return lo + i + 1
+        end = lo
+    return start
+
+
+def submit_upload(file_path: Path, hostname: str, ts: str) -> None:
+    """Queue a finished snapshot for upload to the central server."""
+    print(f"[tick] Queued {file_path} for upload")
+    _UPLOADS.submit(send_to_central_server, file_path, hostname, ts)
+
+
+def stat_log(log_path: str):
+    """Return os.stat of log_path, or None if it is missing or unreadable."""
+    try:
+        return os.stat(log_path)
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        print(f"[warn] Cannot stat {log_path}: {e}")
+        return None
+
+
+def log_fd(log_path: str, st: os.stat_result) -> tuple:
+    """
+    Return (fd, reopened) for log_path, reusing the fd opened on an earlier
+    tick while the path still names the same file (same st_dev/st_ino).
+    reopened is True when a cached fd was replaced because the log rotated.
+    """
+    cached = _FDS.get(log_path)
+    if cached is not None:
+        fd, dev, ino = cached
+        if (dev, ino) == (st.st_dev, st.st_ino):
+            return fd, False
+        os.close(fd)
+        del _FDS[log_path]
+
+    try:
+        fd = os.open(log_path, os.O_RDONLY | _O_NOATIME)
+    except PermissionError:
+        # O_NOATIME needs file ownership; plain read access is enough otherwise
+        fd = os.open(log_path, os.O_RDONLY)
+    _FDS[log_path] = (fd, st.st_dev, st.st_ino)
+    return fd, cached is not None
+
+
+def close_log_fd(log_path: str) -> None:
+    """Forget the cached fd for a log that has disappeared."""
+    cached = _FDS.pop(log_path, None)
+    if cached is not None:
+        os.close(cached[0])
+
+
 def tail_once(offsets: dict, dest_dir: Path, hostname: str) -> None:
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    dest_file = dest_dir / f"logs_{hostname}_{ts}.log"
 
-    written = False
-    with dest_file.open("w", encoding="utf-8", errors="replace") as out:
-        for log_path in LOG_FILES:
-            src = Path(log_path)
-            if not src.exists():
-                continue
+    # New bytes are split into snapshots of at most SNAPSHOT_MAX_BYTES, cut
+    # only after a newline; each finished part is handed to the upload pool so a burst never builds one
+    # huge file or blocks the next tick behind its upload.
+    parts = 0
+    dest_file = out = None
+    room = 0
+    # stat every log at once (the syscalls release the GIL, so slow disks
+    # overlap); copying stays sequential so the snapshot keeps LOG_FILES order
+    changed = []
+    for log_path, st in zip(LOG_FILES, _STATS.map(stat_log, LOG_FILES)):
+        if st is None:
+            close_log_fd(log_path)
+        elif st.st_size != offsets.get(log_path, 0):
+            changed.append((log_path, st))
+
+    # Quiet tick: nothing grew or shrank, so no fd, file or upload is touched
+    if not changed:
+        print("[tick] No new entries in any common logs.")
+        return
 
-            key = str(src)
-            old_off = offsets.get(key, 0)
+    try:
+        for log_path, st in changed:
+            old_off = offsets.get(log_path, 0)
+            size = st.st_size
 
             try:
-                size = src.stat().st_size
+                fd, rotated = log_fd(log_path, st)
             except OSError as e:
-                print(f"[warn] Cannot stat {log_path}: {e}")
+                print(f"[warn] Failed to open {log_path}: {e}")
                 continue
 
-            # Handle rotation/truncate
-            if size < old_off:
+            # Handle rotation (new inode behind the path) / truncate
+            if rotated or size < old_off:
                 print(f"[info] Detected rotation/truncate for {log_path}, resetting offset.")
                 old_off = 0
 
             if size == old_off:
                 continue  # no new data
 
+            # Only raw log bytes are written, no headers
+            pos = old_off
             try:
-                with src.open("rb") as f:
-                    f.seek(old_off)
-                    data = f.read()
+                while pos < size:
+                    if room == 0:
+                        if out is not None:
+                            out.close()
+                            submit_upload(dest_file, hostname, ts)
+                        parts += 1
+                        suffix = "" if parts == 1 else f"_{parts}"
+                        dest_file = dest_dir / f"logs_{hostname}_{ts}{suffix}.log"
+                        out = dest_file.open("wb", buffering=0)
+                        room = SNAPSHOT_MAX_BYTES
+                    count = size - pos
+                    if count > room:
+                        # This part fills up: end it on a line boundary so the
+                        # server never classifies half a line in each part
+                        count = last_line_end(fd, pos, pos + room) - pos
+                        if count == 0:
+                            if room < SNAPSHOT_MAX_BYTES:
+                                room = 0  # start the line in a fresh part
+                                continue
+                            count = room  # one line longer than a whole part
+                    n = copy_range(fd, out, pos, count)
+                    if not n:
+                        break
+                    pos += n
+                    room -= n
             except Exception as e:
-                print(f"[warn] Failed to read {log_path} from offset {old_off}: {e}")
-                continue
+                print(f"[warn] Failed to read {log_path} from offset {pos}: {e}")
 
-            if not data:
+            if pos == old_off:
                 continue
 
-            # Only write raw log data, no headers
-            out.write(data.decode("utf-8", errors="replace"))
-            offsets[key] = size
-            written = True
-            print(f"[ok] Collected {len(data)} bytes from {log_path}")
+            # Bytes already copied are uploaded, so the offset covers them too
+            offsets[log_path] = pos
+            print(f"[ok] Collected {pos - old_off} bytes from {log_path}")
+    finally:
+        if out is not None:
+            out.close()
+            submit_upload(dest_file, hostname, ts)
 
-    if not written:
-        dest_file.unlink(missing_ok=True)
+    if not parts:
         print("[tick] No new entries in any common logs.")
     else:
-        print(f"[tick] New data written to {dest_file}")
-        # Send to central logging server
-        send_to_central_server(dest_file, hostname, ts)
+        print(f"[tick] New data written to {parts} snapshot(s) for {ts}")
 
 
 def main():
     script_dir = Path(__file__).resolve().parent
     dest_dir = script_dir / "tailed_logs"
     dest_dir.mkdir(exist_ok=True)
-    state_file = script_dir / ".log_offsets.json"
+    state_file = script_dir / ".log_offsets.bin"
+    legacy_state_file = script_dir / ".log_offsets.json"
 
     hostname = get_hostname()
     print(f"[init] Hostname detected: {hostname}")
 
-    offsets = load_offsets(state_file)
+    state = open_state(state_file)
+    offsets = load_offsets(state, legacy_state_file)
     print(f"[init] Watching {len(LOG_FILES)} common logs...")
 
     while True:
         try:
             tail_once(offsets, dest_dir, hostname)
-            save_offsets(state_file, offsets)
+            save_offsets(state, offsets)
             print(f"[loop] Sleeping {POLL_INTERVAL_SECS} seconds...\n")
             time.sleep(POLL_INTERVAL_SECS)
         except KeyboardInterrupt:
             print("Exiting.")
             break
 
+    # Let queued snapshots finish uploading before the process exits
+    _UPLOADS.shutdown(wait=True)
+    _STATS.shutdown()
+    state.flush()
+    state.close()
+
 
 if __name__ == "__main__":
     main()
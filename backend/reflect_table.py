@@ -1,5 +1,6 @@
 # reflect_table.py
 from sqlalchemy import create_engine, MetaData, Table
+from sqlalchemy.exc import NoSuchTableError
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 import os
@@ -7,17 +8,18 @@ import os
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL, echo=True)
+# SQL_ECHO=1 logs every emitted statement (reflection alone issues dozens)
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, echo=os.getenv("SQL_ECHO") == "1")
 
 metadata = MetaData()
-metadata.reflect(bind=engine)
 
 table_name = "bad_logs" 
-if table_name not in metadata.tables:
+# Reflect just this table instead of every table in the database
+try:
+    bad_logs_table = Table(table_name, metadata, autoload_with=engine)
+except NoSuchTableError:
     raise ValueError(f"Table '{table_name}' not found in database.")
 
-bad_logs_table = metadata.tables[table_name]
-
 # Print schema
 print("\n📋 Table columns:")
 for col in bad_logs_table.columns:
@@ -31,12 +31,20 @@ B = rack (each B is its own rack, up to 8 servers)
 D = door (entry point at x=0,y=8, treated as free)
 """
 
+import io
 import os
-from heapq import heappush, heappop
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 
 from flask import Flask, jsonify, request, Response
 from flask_cors import CORS
+from numba import njit
+import numpy as np
 import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 # =========================
 # Config
@@ -56,6 +64,13 @@ DB_NAME = os.environ.get("DB_NAME", "datacenter_db")
 DB_USER = os.environ.get("DB_USER", "postgres")
 DB_PASSWORD = os.environ.get("DB_PASSWORD", "CREDS NO LEAK")
 
+# Connection pool bounds (env vars override these defaults)
+DB_POOL_MIN = int(os.environ.get("DB_POOL_MIN", "4"))
+DB_POOL_MAX = int(os.environ.get("DB_POOL_MAX", "32"))
+
+# Connection arguments shared by the pool and the maintenance connection
+DB_KWARGS = dict(host=DB_HOST, port=DB_PORT, user=DB_USER, password=DB_PASSWORD)
+
 # Door (entry) coordinates in our fixed layout
 ENTRY_X = 0
 ENTRY_Y = 8
@@ -67,15 +82,102 @@ CORS(app)
 # DB helpers
 # =========================
 
+db_pool = None
+_db_pool_lock = threading.Lock()
+
+# Static layout, cached in-process once it has been read or created
+_datacenter_info = None
+_datacenter_lock = threading.Lock()
+# datacenter_id -> (layout version, read-only np.int8 grid[y, x] (1 = rack),
+#                   (dist, parent) BFS field from the door or None)
+_grids = {}
+_layout_version = 0  # bumped whenever cells are (re)created; invalidates cached grids/paths
+
+
+def get_pool():
+    """
+    Get or create the process-wide connection pool for DB_NAME.
+
+    Created lazily: DB_NAME may not exist until ensure_database_exists() runs.
+    """
+    global db_pool
+
+    with _db_pool_lock:
+        if db_pool is None:
+            db_pool = ThreadedConnectionPool(
+                DB_POOL_MIN,
+                DB_POOL_MAX,
+                dbname=DB_NAME,
+                connection_factory=PreparedConnection,
+                **DB_KWARGS,
+            )
+        return db_pool
+
+
+# Hot statements, parsed and planned once per connection and run with EXECUTE
+PREPARED_STATEMENTS = {
+    "server_id_by_hostname": "SELECT server_id FROM server WHERE hostname = $1",
+    "delete_server_by_hostname": (
+        "DELETE FROM server WHERE hostname = $1 RETURNING server_id, rack_id, slot"
+    ),
+    # server -> rack -> datacenter -> rack cells -> first adjacent free cell,
+    # in one round-trip (no row if any link is missing)
+    "goal_cell_for_server": """
+        SELECT a.datacenter_id, c2.x, c2.y
+        FROM server s
+        JOIN rack rk ON rk.rack_id = s.rack_id
+        JOIN aisle a ON a.aisle_id = rk.aisle_id
+        JOIN datacenter_cell r
+          ON r.datacenter_id = a.datacenter_id
+         AND r.rack_id = s.rack_id
+         AND r.is_rack = TRUE
+        -- One equality probe per direction, each an index seek on
+        -- uq_cell_coord (datacenter_id, x, y); an OR of the four
+        -- predicates cannot use the index and scans every cell per rack cell
+        CROSS JOIN LATERAL (
+            SELECT n.x, n.y
+            FROM (VALUES (1, 0), (-1, 0), (0, 1), (0, -1)) AS d(dx, dy)
+            JOIN datacenter_cell n
+              ON n.datacenter_id = r.datacenter_id
+             AND n.x = r.x + d.dx
+             AND n.y = r.y + d.dy
+            WHERE n.is_rack = FALSE
+        ) c2
+        WHERE s.server_id = $1
+        ORDER BY c2.x, c2.y
+        LIMIT 1
+    """,
+}
+
+
+class PreparedConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that PREPAREs PREPARED_STATEMENTS on first use."""
+
+    prepared = False
+
+    def prepare_statements(self):
+        if self.prepared:
+            return
+        with self:
+            with self.cursor() as cur:
+                for name, sql in PREPARED_STATEMENTS.items():
+                    cur.execute(f"PREPARE {name} AS {sql};")
+        self.prepared = True
+
+
+@contextmanager
 def get_conn():
-    """Connect to the application database (datacenter_db)."""
-    return psycopg2.connect(
-        host=DB_HOST,
-        port=DB_PORT,
-        dbname=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD,
-    )
+    """Borrow a pooled connection to the application database (datacenter_db)."""
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        # The statements reference the schema, so wait until it is known to exist
+        if _datacenter_info is not None:
+            conn.prepare_statements()
+        yield conn
+    finally:
+        # Broken connections are discarded; putconn rolls back anything left open
+        pool.putconn(conn, close=bool(conn.closed))
 
 
 def ensure_database_exists():
@@ -87,13 +189,7 @@ def ensure_database_exists():
     so we use autocommit and DO NOT wrap this in "with conn:".
     """
     maintenance_db = "postgres"
-    conn = psycopg2.connect(
-        host=DB_HOST,
-        port=DB_PORT,
-        dbname=maintenance_db,
-        user=DB_USER,
-        password=DB_PASSWORD,
-    )
+    conn = psycopg2.connect(dbname=maintenance_db, **DB_KWARGS)
     try:
         conn.autocommit = True
         with conn.cursor() as cur:
@@ -187,14 +283,11 @@ def init_schema():
         """
     ]
 
-    conn = get_conn()
-    try:
+    with get_conn() as conn:
         with conn:
             with conn.cursor() as cur:
                 for ddl in ddl_statements:
                     cur.execute(ddl)
-    finally:
-        conn.close()
 
 
 def ensure_datacenter_exists():
@@ -203,6 +296,9 @@ def ensure_datacenter_exists():
     - If a datacenter already exists, return its info.
     - If none exists, create our fixed layout and return its info.
 
+    The layout never changes once it exists, so the first successful call is
+    memoized and later calls (one per request) return without touching the DB.
+
     Returns dict:
     {
       "datacenter_id": ...,
@@ -211,13 +307,27 @@ def ensure_datacenter_exists():
       "created": True/False
     }
     """
-    global ENTRY_X, ENTRY_Y
+    global _datacenter_info
+
+    if _datacenter_info is not None:
+        return _datacenter_info
+
+    with _datacenter_lock:
+        if _datacenter_info is not None:
+            return _datacenter_info
+        info = bootstrap_datacenter()
+        _datacenter_info = dict(info, created=False)
+        return info
+
+
+def bootstrap_datacenter():
+    """Create the database, schema and fixed layout as needed; see ensure_datacenter_exists."""
+    global ENTRY_X, ENTRY_Y, _layout_version
 
     ensure_database_exists()
     init_schema()
 
-    conn = get_conn()
-    try:
+    with get_conn() as conn:
         with conn:
             with conn.cursor() as cur:
                 # Check if a datacenter already exists
@@ -284,49 +394,52 @@ def ensure_datacenter_exists():
                     "DWWWWWWWWW",  # y = 8
                 ]
 
-                rack_count = 0
-
+                # Walk the layout once, then insert all racks and all cells
+                # with one execute_values each (2 round-trips instead of 90)
+                rack_rows = []
+                cells = []  # (x, y, rack label or None), in layout order
                 for y, row_layout in enumerate(layout):
                     for x, cell in enumerate(row_layout):
                         if cell == "B":
-                            rack_count += 1
-                            label = f"R{rack_count}"
-                            cur.execute(
-                                """
-                                INSERT INTO rack (aisle_id, label, max_servers)
-                                VALUES (%s, %s, %s)
-                                RETURNING rack_id;
-                                """,
-                                (aisle_id, label, 8)
-                            )
-                            rack_id = cur.fetchone()[0]
-
-                            cur.execute(
-                                """
-                                INSERT INTO datacenter_cell (datacenter_id, x, y, is_rack, rack_id)
-                                VALUES (%s, %s, %s, TRUE, %s);
-                                """,
-                                (dc_id, x, y, rack_id)
-                            )
-
-                        elif cell == "W":
-                            cur.execute(
-                                """
-                                INSERT INTO datacenter_cell (datacenter_id, x, y, is_rack)
-                                VALUES (%s, %s, %s, FALSE);
-                                """,
-                                (dc_id, x, y)
-                            )
-
-                        elif cell == "D":
-                            cur.execute(
-                                """
-                                INSERT INTO datacenter_cell (datacenter_id, x, y, is_rack)
-                                VALUES (%s, %s, %s, FALSE);
-                                """,
-                                (dc_id, x, y)
-                            )
-                            ENTRY_X, ENTRY_Y = x, y
+                            label = f"R{len(rack_rows) + 1}"
+                            rack_rows.append((aisle_id, label, 8))
+                            cells.append((x, y, label))
+                        elif cell in ("W", "D"):
+                            cells.append((x, y, None))
+                            if cell == "D":
+                                ENTRY_X, ENTRY_Y = x, y
+
+                # Map ids back by label: RETURNING order is not guaranteed
+                rack_ids = dict(
+                    (label, rack_id)
+                    for rack_id, label in execute_values(
+                        cur,
+                        """
+                        INSERT INTO rack (aisle_id, label, max_servers)
+                        VALUES %s
+                        RETURNING rack_id, label;
+                        """,
+                        rack_rows,
+                        page_size=len(rack_rows),
+                        fetch=True,
+                    )
+                )
+
+                cell_rows = [
+                    (dc_id, x, y, label is not None, rack_ids.get(label))
+                    for x, y, label in cells
+                ]
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO datacenter_cell (datacenter_id, x, y, is_rack, rack_id)
+                    VALUES %s;
+                    """,
+                    cell_rows,
+                    page_size=len(cell_rows),
+                )
+                rack_count = len(rack_rows)
+                _layout_version += 1
 
                 return {
                     "datacenter_id": dc_id,
@@ -335,89 +448,353 @@ def ensure_datacenter_exists():
                     "created": True,
                 }
 
-    finally:
-        conn.close()
-
 
 # =========================
 # Pathfinding (A*)
 # =========================
 
-def neighbors(x, y):
-    """4-directional neighbors."""
-    for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-        yield x + dx, y + dy
+@njit(cache=True)
+def _astar_kernel(grid, sx, sy, gx, gy):
+    """
+    A* over grid[y, x] (0 free, 1 blocked) from (sx, sy) to (gx, gy).
+
+    Nodes are packed as x * H + y. f = g + Manhattan is a small integer that
+    never decreases from one pop to the next (the heuristic is consistent), so
+    the open set is a bucket queue (Dial's algorithm) with an O(1) push and
+    pop. Ties within a bucket pop newest first. Returns the path as packed ids,
+    start first; empty if none.
+    """
+    height, width = grid.shape
+    # Per-node state in flat arrays indexed by the packed id: no tuples, and
+    # the x/y neighbours are simply node +/- height and node +/- 1
+    g_score = np.full(width * height, -1, np.int32)  # -1 = not reached yet
+    came_from = np.full(width * height, -1, np.int32)
+    # Manhattan is consistent on a 4-connected unit grid, so a node's g-score
+    # is final once popped; stale queue entries for it are skipped
+    closed = np.zeros(width * height, np.bool_)
+
+    # Bucket queue as intrusive linked lists: bucket_head[f] is the newest
+    # entry with that f, entry_next chains to older ones (-1 ends a list).
+    # f is bounded by the longest possible path plus the grid's diameter, and
+    # a node is pushed at most once per incoming edge.
+    bucket_head = np.full(width * height + width + height + 1, -1, np.int32)
+    capacity = 4 * width * height + 1
+    entry_node = np.empty(capacity, np.int32)
+    entry_next = np.empty(capacity, np.int32)
+
+    # Manhattan distance split per axis: h(x, y) = hx[x] + hy[y], two loads
+    hx = np.abs(np.arange(width, dtype=np.int32) - gx)
+    hy = np.abs(np.arange(height, dtype=np.int32) - gy)
+
+    start = sx * height + sy
+    goal = gx * height + gy
+    g_score[start] = 0
+    f_min = hx[sx] + hy[sy]
+    entry_node[0] = start
+    entry_next[0] = -1
+    bucket_head[f_min] = 0
+    entries = 1
+    pending = 1
+
+    while pending > 0:
+        # Pop: advance to the lowest non-empty bucket (never moves backwards)
+        while bucket_head[f_min] == -1:
+            f_min += 1
+        e = bucket_head[f_min]
+        bucket_head[f_min] = entry_next[e]
+        pending -= 1
+        node = entry_node[e]
+
+        if closed[node]:
+            continue
+        closed[node] = True
+
+        if node == goal:
+            # Reconstruct path by walking came_from back to the start
+            length = 1
+            n = node
+            while came_from[n] != -1:
+                n = came_from[n]
+                length += 1
+            path = np.empty(length, np.int32)
+            n = node
+            for i in range(length - 1, -1, -1):
+                path[i] = n
+                n = came_from[n]
+            return path
+
+        cx = node // height
+        cy = node % height
+        tentative_g = g_score[node] + 1
+
+        # Explore neighbors: +x, -x, +y, -y. Left as a loop over the offsets:
+        # writing the four expansions out by hand measured no faster here
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nx = cx + dx
+            ny = cy + dy
+            if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                continue
+            neighbor = node + dx * height + dy
+            if grid[ny, nx] == 1 or closed[neighbor]:  # blocked (rack) or settled
+                continue
+
+            if g_score[neighbor] == -1 or tentative_g < g_score[neighbor]:
+                came_from[neighbor] = node
+                g_score[neighbor] = tentative_g
+                f = tentative_g + hx[nx] + hy[ny]  # + Manhattan distance
 
+                # Push: prepend to bucket f
+                entry_node[entries] = neighbor
+                entry_next[entries] = bucket_head[f]
+                bucket_head[f] = entries
+                entries += 1
+                pending += 1
 
-def heuristic(a, b):
-    """Manhattan distance."""
-    (x1, y1), (x2, y2) = a, b
-    return abs(x1 - x2) + abs(y1 - y2)
+    return np.empty(0, np.int32)
+
+
+@njit(cache=True)
+def _bfs_field(grid, sx, sy):
+    """
+    Breadth-first search over free cells from (sx, sy). Returns (dist, parent),
+    both int32 indexed [x * height + y]: dist is the step count (-1 if
+    unreachable) and parent the previous cell on a shortest path (-1 at the
+    start). Any goal's path is then read off parent in O(path length).
+    """
+    height, width = grid.shape
+    dist = np.full(width * height, -1, np.int32)
+    parent = np.full(width * height, -1, np.int32)
+    queue = np.empty(width * height, np.int32)  # every cell is enqueued at most once
+
+    start = sx * height + sy
+    dist[start] = 0
+    queue[0] = start
+    head = 0
+    tail = 1
+    while head < tail:
+        node = queue[head]
+        head += 1
+        cx = node // height
+        cy = node % height
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nx = cx + dx
+            ny = cy + dy
+            if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                continue
+            neighbor = node + dx * height + dy
+            if grid[ny, nx] == 1 or dist[neighbor] != -1:
+                continue
+            dist[neighbor] = dist[node] + 1
+            parent[neighbor] = node
+            queue[tail] = neighbor
+            tail += 1
+
+    return dist, parent
+
+
+@njit(cache=True)
+def _trace_field(dist, parent, goal):
+    """Node ids from the field's start to goal, or an empty array if unreachable."""
+    if dist[goal] == -1:
+        return np.empty(0, np.int32)
+    path = np.empty(dist[goal] + 1, np.int32)
+    n = goal
+    for i in range(len(path) - 1, -1, -1):
+        path[i] = n
+        n = parent[n]
+    return path
+
+
+class _StaleGrid(Exception):
+    """The cached grid is not the layout version a path was asked for."""
+
+
+def shortest_path(datacenter_id, layout_version, start, goal):
+    """
+    Shortest path over the datacenter's cached grid (call load_grid first),
+    memoized per layout version: the layout is static, so a path never
+    changes until the version does. Returns a tuple of (x, y) or None.
+    """
+    try:
+        return _memoized_path(datacenter_id, layout_version, start, goal)
+    except _StaleGrid:
+        # The cache holds another version's grid: answer from it uncached, so
+        # the result is never memoized under a version it was not computed on
+        return grid_path(_grids[datacenter_id], start, goal)
+
+
+@lru_cache(maxsize=4096)
+def _memoized_path(datacenter_id, layout_version, start, goal):
+    entry = _grids[datacenter_id]
+    if entry[0] != layout_version:
+        raise _StaleGrid  # exceptions are never cached by lru_cache
+    return grid_path(entry, start, goal)
+
+
+def grid_path(entry, start, goal):
+    """
+    Path over one _grids entry. The door is every route's start, so its paths
+    are read off the door field; astar is kept on purpose for any other start
+    (the door field cannot answer those), not as a fallback the routes reach.
+    """
+    _, grid, door_field = entry
+    if start == (ENTRY_X, ENTRY_Y):
+        if door_field is None:  # door out of bounds or blocked
+            return None
+        path = walk_field(door_field, goal, grid)
+    else:
+        path = astar(start, goal, grid)
+    return tuple(path) if path is not None else None
+
+
+def walk_field(field, goal, grid):
+    """
+    Path from a _bfs_field's start to goal (x, y), by walking its parent
+    links back from the goal. Returns list of (x, y) or None.
+    """
+    if not in_bounds(goal, grid) or grid[goal[1], goal[0]] == 1:
+        return None
+
+    height = grid.shape[0]
+    dist, parent = field
+    path = _trace_field(dist, parent, goal[0] * height + goal[1])
+    if len(path) == 0:
+        return None
+    return [(node // height, node % height) for node in path.tolist()]
+
+
+def in_bounds(pos, grid):
+    """True if (x, y) lies inside the grid array."""
+    x, y = pos
+    height, width = grid.shape
+    return 0 <= x < width and 0 <= y < height
 
 
 def astar(start, goal, grid):
     """
-    A* over a dict grid: (x,y) -> 0 (free) or 1 (blocked).
+    A* over a grid array: grid[y, x] is 0 (free) or 1 (blocked).
     start, goal are (x, y).
     Returns list of (x, y) or None.
+
+    The search itself runs in the Numba-compiled _astar_kernel.
     """
-    if start not in grid or goal not in grid:
+    if not in_bounds(start, grid) or not in_bounds(goal, grid):
         return None
-    if grid[start] == 1 or grid[goal] == 1:
+    if grid[start[1], start[0]] == 1 or grid[goal[1], goal[0]] == 1:
         return None
 
-    open_set = []
-    heappush(open_set, (0, start))
-    came_from = {}
-    g_score = {start: 0}
-
-    while open_set:
-        _, current = heappop(open_set)
-
-        if current == goal:
-            # Reconstruct path
-            path = [current]
-            while current in came_from:
-                current = came_from[current]
-                path.append(current)
-            return list(reversed(path))
-
-        # Explore neighbors
-        for nx, ny in neighbors(*current):
-            neighbor = (nx, ny)
-            if neighbor not in grid:
-                continue
-            if grid[neighbor] == 1:  # blocked (rack)
-                continue
+    path = _astar_kernel(grid, start[0], start[1], goal[0], goal[1])
+    if len(path) == 0:
+        return None
 
-            tentative_g = g_score[current] + 1
-            if tentative_g < g_score.get(neighbor, float("inf")):
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g
-                f = tentative_g + heuristic(neighbor, goal)
-                heappush(open_set, (f, neighbor))
+    height = grid.shape[0]
+    return [(node // height, node % height) for node in path.tolist()]
 
-    return None
+
+RENDER_CHUNK_ROWS = 256  # rows per streamed block of the ASCII map
+
+
+def render_grid(grid, path, start, goal):
+    """
+    Render the grid as ASCII art ("D G * B W", space-separated, one row per
+    line), painting every cell with NumPy instead of a per-cell Python loop.
+    Yields the map as bytes, RENDER_CHUNK_ROWS rows at a time, so it can be
+    streamed without ever joining one full-size string.
+    """
+    height, width = grid.shape
+    chars = np.where(grid == 1, b"B", b"W")
+    if path:
+        xs, ys = np.array(path, dtype=np.intp).T
+        chars[ys, xs] = b"*"  # path cells are always free
+    for (x, y), ch in ((goal, b"G"), (start, b"D")):
+        if in_bounds((x, y), grid):
+            chars[y, x] = ch
+
+    if height == 0 or width == 0:
+        yield b"\n"
+        return
+
+    # Each row is "c c ... c\n": cells at even columns, spaces between
+    out = np.full((min(height, RENDER_CHUNK_ROWS), 2 * width), b" ", dtype="S1")
+    out[:, -1:] = b"\n"
+    for y0 in range(0, height, RENDER_CHUNK_ROWS):
+        rows = chars[y0:y0 + RENDER_CHUNK_ROWS]
+        block = out[:len(rows)]
+        block[:, 0::2] = rows
+        yield block.tobytes()
 
 
 # =========================
 # Data helpers
 # =========================
 
+# One COPY BINARY tuple of (x INTEGER, y INTEGER, is_rack BOOLEAN), all NOT
+# NULL: a field count, then a length word before each big-endian value
+_CELL_COPY_DTYPE = np.dtype([
+    ("nfields", ">i2"),
+    ("x_len", ">i4"), ("x", ">i4"),
+    ("y_len", ">i4"), ("y", ">i4"),
+    ("is_rack_len", ">i4"), ("is_rack", "i1"),
+])
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+
+
+def decode_cell_copy(data):
+    """
+    Decode a COPY ... TO STDOUT WITH (FORMAT BINARY) stream of (x, y, is_rack)
+    rows into a structured array without touching the rows in Python.
+    """
+    if bytes(data[:11]) != _COPY_SIGNATURE:
+        raise ValueError("Unexpected COPY BINARY header.")
+    # Fixed header: signature, flags word, then a length-prefixed extension area
+    start = 19 + int.from_bytes(data[15:19], "big")
+    end = len(data) - 2  # trailer: field count -1
+    return np.frombuffer(data[start:end], dtype=_CELL_COPY_DTYPE)
+
+
 def load_grid(conn, datacenter_id):
-    """Return dict: (x,y) -> 0 (free) or 1 (rack)."""
-    grid = {}
+    """
+    Return the datacenter's grid as a read-only np.int8 array indexed
+    grid[y, x]: 0 (free) or 1 (rack), about 1 byte per cell. Cells missing
+    from the table count as blocked. The layout is static, so it is read from
+    the DB (and the door field built) once per process.
+    """
+    cached = _grids.get(datacenter_id)
+    if cached is not None and cached[0] == _layout_version:
+        return cached[1]
+    version = _layout_version
+
+    # COPY in binary format ships the cells as one packed buffer that NumPy
+    # decodes in place; no per-row Python tuples or ints are created
+    buf = io.BytesIO()
     with conn.cursor() as cur:
-        cur.execute(
+        query = cur.mogrify(
             """
-            SELECT x, y, is_rack
-            FROM datacenter_cell
-            WHERE datacenter_id = %s;
+            COPY (
+                SELECT x, y, is_rack
+                FROM datacenter_cell
+                WHERE datacenter_id = %s
+            ) TO STDOUT WITH (FORMAT BINARY);
             """,
             (datacenter_id,)
         )
-        for x, y, is_rack in cur.fetchall():
-            grid[(x, y)] = 1 if is_rack else 0
+        cur.copy_expert(query, buf)
+    cells = decode_cell_copy(buf.getbuffer())
+
+    # Size from the fetched coordinates, then fill every cell in one scatter
+    xs, ys, is_rack = cells["x"], cells["y"], cells["is_rack"]
+    width = int(xs.max()) + 1 if len(cells) else 0
+    height = int(ys.max()) + 1 if len(cells) else 0
+    grid = np.ones((height, width), dtype=np.int8)
+    grid[ys, xs] = is_rack
+    grid.flags.writeable = False  # shared by every request thread
+    # The door never moves, so search from it once per layout: every /path
+    # query then just walks the parent links
+    door_field = None
+    if in_bounds((ENTRY_X, ENTRY_Y), grid) and grid[ENTRY_Y, ENTRY_X] == 0:
+        door_field = _bfs_field(grid, ENTRY_X, ENTRY_Y)
+
+    _grids[datacenter_id] = (version, grid, door_field)
     return grid
 
 
@@ -429,60 +806,12 @@ def find_goal_cell_for_server(conn, server_id):
     Returns (datacenter_id, (goal_x, goal_y)) or None.
     """
     with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT s.rack_id, a.datacenter_id
-            FROM server s
-            JOIN rack r ON r.rack_id = s.rack_id
-            JOIN aisle a ON a.aisle_id = r.aisle_id
-            WHERE s.server_id = %s;
-            """,
-            (server_id,)
-        )
+        cur.execute("EXECUTE goal_cell_for_server (%s);", (server_id,))
         row = cur.fetchone()
         if not row:
             return None
-        rack_id, datacenter_id = row
 
-        cur.execute(
-            """
-            SELECT x, y
-            FROM datacenter_cell
-            WHERE datacenter_id = %s
-              AND rack_id = %s
-              AND is_rack = TRUE;
-            """,
-            (datacenter_id, rack_id)
-        )
-        rack_cells = cur.fetchall()
-        if not rack_cells:
-            return None
-
-        cur.execute(
-            """
-            SELECT DISTINCT c2.x, c2.y
-            FROM datacenter_cell r
-            JOIN datacenter_cell c2
-              ON c2.datacenter_id = r.datacenter_id
-             AND c2.is_rack = FALSE
-             AND (
-                    (c2.x = r.x + 1 AND c2.y = r.y)
-                 OR (c2.x = r.x - 1 AND c2.y = r.y)
-                 OR (c2.x = r.x AND c2.y = r.y + 1)
-                 OR (c2.x = r.x AND c2.y = r.y - 1)
-                 )
-            WHERE r.datacenter_id = %s
-              AND r.rack_id = %s
-              AND r.is_rack = TRUE
-            LIMIT 1;
-            """,
-            (datacenter_id, rack_id)
-        )
-        adj = cur.fetchone()
-        if not adj:
-            return None
-
-        goal_x, goal_y = adj
+        datacenter_id, goal_x, goal_y = row
         return datacenter_id, (goal_x, goal_y)
 
 
@@ -496,8 +825,10 @@ def create_server_with_location(conn, rack_id, hostname, serial_number, slot=Non
     Returns (server_id, assigned_slot).
     """
     with conn.cursor() as cur:
+        # Lock the rack row: concurrent allocations on one rack queue here, so
+        # the free-slot pick below always sees every committed server
         cur.execute(
-            "SELECT max_servers FROM rack WHERE rack_id = %s;",
+            "SELECT max_servers FROM rack WHERE rack_id = %s FOR UPDATE;",
             (rack_id,)
         )
         row = cur.fetchone()
@@ -505,47 +836,54 @@ def create_server_with_location(conn, rack_id, hostname, serial_number, slot=Non
             raise ValueError(f"Rack {rack_id} does not exist.")
         (max_servers,) = row
 
-        cur.execute(
-            """
-            SELECT 1
-            FROM server
-            WHERE hostname = %s OR serial_number = %s;
-            """,
-            (hostname, serial_number)
-        )
-        if cur.fetchone():
-            raise ValueError("Hostname or serial_number already in use.")
-
-        cur.execute(
-            "SELECT slot FROM server WHERE rack_id = %s ORDER BY slot;",
-            (rack_id,)
-        )
-        used_slots = [r[0] for r in cur.fetchall()]
-
-        if slot is None:
-            assigned_slot = None
-            for s in range(1, max_servers + 1):
-                if s not in used_slots:
-                    assigned_slot = s
-                    break
-            if assigned_slot is None:
-                raise ValueError(f"Rack {rack_id} is full.")
-        else:
-            if slot < 1 or slot > max_servers:
-                raise ValueError(f"Slot must be between 1 and {max_servers}.")
-            if slot in used_slots:
-                raise ValueError(f"Slot {slot} is already occupied on rack {rack_id}.")
-            assigned_slot = slot
+        if slot is not None and (slot < 1 or slot > max_servers):
+            raise ValueError(f"Slot must be between 1 and {max_servers}.")
 
+        # Pick the lowest free slot (or check the requested one) and insert
+        # in the same statement. A duplicate hostname/serial skips the row
+        # instead of raising, so the transaction is never left aborted.
         cur.execute(
             """
             INSERT INTO server (rack_id, hostname, serial_number, slot)
-            VALUES (%s, %s, %s, %s)
-            RETURNING server_id;
+            SELECT %(rack_id)s, %(hostname)s, %(serial_number)s, gs
+            FROM generate_series(1, %(max_servers)s) AS gs
+            WHERE (%(slot)s::integer IS NULL OR gs = %(slot)s::integer)
+              AND NOT EXISTS (
+                    SELECT 1 FROM server
+                    WHERE rack_id = %(rack_id)s AND slot = gs
+              )
+            ORDER BY gs
+            LIMIT 1
+            ON CONFLICT DO NOTHING
+            RETURNING server_id, slot;
             """,
-            (rack_id, hostname, serial_number, assigned_slot)
+            {
+                "rack_id": rack_id,
+                "hostname": hostname,
+                "serial_number": serial_number,
+                "max_servers": max_servers,
+                "slot": slot,
+            }
         )
-        (server_id,) = cur.fetchone()
+        row = cur.fetchone()
+        if not row:
+            # Failure path only: tell a duplicate apart from a full rack/slot
+            cur.execute(
+                """
+                SELECT EXISTS (
+                    SELECT 1 FROM server
+                    WHERE hostname = %s OR serial_number = %s
+                );
+                """,
+                (hostname, serial_number)
+            )
+            if cur.fetchone()[0]:
+                raise ValueError("Hostname or serial_number already in use.")
+            if slot is None:
+                raise ValueError(f"Rack {rack_id} is full.")
+            raise ValueError(f"Slot {slot} is already occupied on rack {rack_id}.")
+
+        server_id, assigned_slot = row
         return server_id, assigned_slot
 
 
@@ -596,8 +934,7 @@ def add_server():
             "message": "rack_id, hostname, and serial_number are required"
         }), 400
 
-    conn = get_conn()
-    try:
+    with get_conn() as conn:
         with conn:
             try:
                 server_id, assigned_slot = create_server_with_location(
@@ -615,9 +952,6 @@ def add_server():
             "slot": assigned_slot
         })
 
-    finally:
-        conn.close()
-
 
 @app.route("/servers/<hostname>", methods=["DELETE"])
 def delete_server(hostname):
@@ -628,18 +962,10 @@ def delete_server(hostname):
     """
     ensure_datacenter_exists()
 
-    conn = get_conn()
-    try:
+    with get_conn() as conn:
         with conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    DELETE FROM server
-                    WHERE hostname = %s
-                    RETURNING server_id, rack_id, slot;
-                    """,
-                    (hostname,)
-                )
+                cur.execute("EXECUTE delete_server_by_hostname (%s);", (hostname,))
                 row = cur.fetchone()
                 if not row:
                     return jsonify({
@@ -658,9 +984,6 @@ def delete_server(hostname):
             "slot": slot
         })
 
-    finally:
-        conn.close()
-
 
 @app.route("/servers/list", methods=["GET"])
 def list_servers():
@@ -669,8 +992,7 @@ def list_servers():
     """
     ensure_datacenter_exists()
 
-    conn = get_conn()
-    try:
+    with get_conn() as conn:
         with conn:
             with conn.cursor() as cur:
                 cur.execute(
@@ -732,9 +1054,6 @@ def list_servers():
             "servers": servers
         })
 
-    finally:
-        conn.close()
-
 
 @app.route("/path/<int:server_id>", methods=["GET"])
 def get_path(server_id):
@@ -745,8 +1064,7 @@ def get_path(server_id):
     info = ensure_datacenter_exists()
     datacenter_id = info["datacenter_id"]
 
-    conn = get_conn()
-    try:
+    with get_conn() as conn:
         with conn:
             goal_info = find_goal_cell_for_server(conn, server_id)
             if not goal_info:
@@ -762,12 +1080,12 @@ def get_path(server_id):
                     "message": "Server belongs to a different datacenter (unexpected)"
                 }), 400
 
-            grid = load_grid(conn, datacenter_id)
+            load_grid(conn, datacenter_id)  # populate the grid cache shortest_path reads
 
         start = (ENTRY_X, ENTRY_Y)
         goal = (goal_x, goal_y)
 
-        path = astar(start, goal, grid)
+        path = shortest_path(datacenter_id, _layout_version, start, goal)
         if path is None:
             return jsonify({
                 "status": "error",
@@ -788,9 +1106,6 @@ def get_path(server_id):
             "path": path_list
         })
 
-    finally:
-        conn.close()
-
 
 @app.route("/path/hostname/<hostname>", methods=["GET"])
 def get_path_by_hostname(hostname):
@@ -798,11 +1113,10 @@ def get_path_by_hostname(hostname):
     Compute path from the door (D) to a given server's rack by hostname.
     """
     ensure_datacenter_exists()
-    conn = get_conn()
-    try:
+    with get_conn() as conn:
         with conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT server_id FROM server WHERE hostname = %s;", (hostname,))
+                cur.execute("EXECUTE server_id_by_hostname (%s);", (hostname,))
                 row = cur.fetchone()
                 if not row:
                     return jsonify({
@@ -810,8 +1124,6 @@ def get_path_by_hostname(hostname):
                         "message": f"No server found with hostname '{hostname}'"
                     }), 404
                 (server_id,) = row
-    finally:
-        conn.close()
 
     return get_path(server_id)
 
@@ -831,8 +1143,7 @@ def visualize(server_id):
     info = ensure_datacenter_exists()
     datacenter_id = info["datacenter_id"]
 
-    conn = get_conn()
-    try:
+    with get_conn() as conn:
         with conn:
             goal_info = find_goal_cell_for_server(conn, server_id)
             if not goal_info:
@@ -855,40 +1166,9 @@ def visualize(server_id):
         start = (ENTRY_X, ENTRY_Y)
         goal = (goal_x, goal_y)
 
-        path = astar(start, goal, grid)
-        path_set = set(path) if path else set()
-
-        xs = [x for (x, _) in grid.keys()]
-        ys = [y for (_, y) in grid.keys()]
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
-
-        lines = []
-        for y in range(min_y, max_y + 1):
-            row_chars = []
-            for x in range(min_x, max_x + 1):
-                pos = (x, y)
-                is_rack = (grid.get(pos, 1) == 1)
-
-                if pos == (ENTRY_X, ENTRY_Y):
-                    ch = "D"
-                elif pos == (goal_x, goal_y):
-                    ch = "G"
-                elif pos in path_set and not is_rack:
-                    ch = "*"
-                elif is_rack:
-                    ch = "B"
-                else:
-                    ch = "W"
-
-                row_chars.append(ch)
-            lines.append(" ".join(row_chars))
-
-        ascii_map = "\n".join(lines) + "\n"
-        return Response(ascii_map, mimetype="text/plain")
-
-    finally:
-        conn.close()
+        path = shortest_path(datacenter_id, _layout_version, start, goal)
+        # Streamed: rows go out as they are rendered, no full-size string
+        return Response(render_grid(grid, path, start, goal), mimetype="text/plain")
 
 
 @app.route("/visualize/hostname/<hostname>", methods=["GET"])
@@ -897,11 +1177,10 @@ def visualize_by_hostname(hostname):
     ASCII visualization of path to server, by hostname instead of ID.
     """
     ensure_datacenter_exists()
-    conn = get_conn()
-    try:
+    with get_conn() as conn:
         with conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT server_id FROM server WHERE hostname = %s;", (hostname,))
+                cur.execute("EXECUTE server_id_by_hostname (%s);", (hostname,))
                 row = cur.fetchone()
                 if not row:
                     return Response(
@@ -910,8 +1189,6 @@ def visualize_by_hostname(hostname):
                         status=404
                     )
                 (server_id,) = row
-    finally:
-        conn.close()
 
     return visualize(server_id)
 
@@ -923,6 +1200,10 @@ def health():
     """
     try:
         info = ensure_datacenter_exists()
+        # The datacenter info is memoized, so ping the DB explicitly
+        with get_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
         return jsonify({
             "status": "ok",
             "datacenter_id": info["datacenter_id"],